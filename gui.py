@@ -9,26 +9,53 @@
 - 结果显示
 """
 
+import io
 import os
+import re
 import sys
 import queue
 import threading
+import collections
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
 from tkinter import filedialog, messagebox, ttk
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
 
 # 尝试导入requests，如果失败则提供一个替代方案
 try:
     import requests
     import json
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
     print("警告: requests模块未安装，版本检测功能将不可用")
+
+# 版本号比较优先使用packaging（支持预发布版本等PEP 440格式），未安装时按数字逐段比较
+try:
+    from packaging.version import Version, InvalidVersion
+    PACKAGING_AVAILABLE = True
+except ImportError:
+    PACKAGING_AVAILABLE = False
 from .config import get_config_manager
 from .encryption_detector import get_encryption_detector
 from .file_processor import get_file_processor
-from .logger import get_logger
+from .logger import get_logger, get_logger_manager
+
+# 结果显示区域最多保留的行数，超出部分从头部淘汰（完整记录可导出）
+MAX_RESULT_LINES = 2000
+
+# 检测状态对应的显示标签
+_STATUS_TAG = {
+    '未加密': 'info',
+    '已加密': 'warning',
+    '未识别': 'warning',
+    '文件不存在': 'error'
+}
+
+# 版本标签前缀（如 v5.1 -> 5.1），只去掉一个 v
+_TAG_STRIP = re.compile(r'^v')
 
 
 class YSTApplication(tk.Tk):
@@ -42,11 +69,42 @@ class YSTApplication(tk.Tk):
         self.detector = get_encryption_detector()
         self.processor = get_file_processor()
         self.logger = get_logger()
+        self.logger_manager = get_logger_manager()
         
         # 任务管理
-        self.task_queue = queue.Queue()
-        self.thread_pool = []
         self.max_threads = self.config_manager.get_settings().get('max_threads', 5)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_threads,
+                                           thread_name_prefix="yst-decrypt")
+        
+        # 窗口关闭标志，后台遍历和扫描检测到后尽快退出
+        self._closing = threading.Event()
+        
+        # 版本检查使用的HTTP会话（复用连接，失败自动重试）
+        self._http = None
+        if REQUESTS_AVAILABLE:
+            self._http = requests.Session()
+            self._http.mount("https://", HTTPAdapter(max_retries=Retry(
+                total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504),
+                read=False,  # 读取超时不重试，直接抛出原异常，由超时分支处理
+                raise_on_status=False  # 重试用尽后返回响应，由状态码分支处理
+            )))
+        
+        # 结果显示缓冲
+        self._pending_results = collections.deque(maxlen=MAX_RESULT_LINES)
+        self._flush_scheduled = False
+        self._result_log: List[str] = []
+        
+        # 文件头列表显示缓存，添加文件头时失效
+        self._headers_rendered: Optional[str] = None
+        
+        # 工作线程通过队列回传结果，由界面线程统一取出显示
+        self._ui_queue = queue.Queue()
+        # 结果批次编号，清空结果时递增，旧批次的结果和扫描随之作废
+        self._generation = 0
+        # 未完成的后台任务数，只在有任务时轮询结果队列
+        self._outstanding = 0
+        self._outstanding_lock = threading.Lock()
+        self._drain_after_id = None
         
         # 初始化界面
         self.setup_window()
@@ -54,8 +112,8 @@ class YSTApplication(tk.Tk):
         self.setup_main_frame()  # 先设置主界面
         self.setup_menu()  # 再设置菜单
         
-        # 启动任务处理
-        self.after(100, self.process_queue)
+        # 关闭窗口时停止后台任务
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         
         self.logger.info("图形界面初始化完成")
     
@@ -84,6 +142,9 @@ class YSTApplication(tk.Tk):
         # 主界面菜单
         menubar.add_command(label="主界面", command=self.show_main_frame)
         
+        # 导出结果菜单
+        menubar.add_command(label="导出结果", command=self.export_results)
+        
         # 设置菜单
         menubar.add_command(label="设置", command=self.show_settings_frame)
         
@@ -91,7 +152,7 @@ class YSTApplication(tk.Tk):
         menubar.add_command(label="关于", command=self.show_about_frame)
         
         # 退出菜单
-        menubar.add_command(label="退出", command=self.quit)
+        menubar.add_command(label="退出", command=self._on_close)
     
     def clear_frames(self) -> None:
         """清除所有界面帧"""
@@ -100,6 +161,9 @@ class YSTApplication(tk.Tk):
             if frame:
                 frame.destroy()
                 setattr(self, frame_name, None)
+        
+        # 结果显示控件随主界面一起销毁，未显示的结果保留在缓冲中
+        self.result_text = None
     
     def show_main_frame(self) -> None:
         """显示主界面"""
@@ -125,6 +189,11 @@ class YSTApplication(tk.Tk):
         
         # 结果显示区域
         self.setup_result_display()
+        
+        # 显示离开主界面期间缓冲的结果
+        if self._pending_results and not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.after(50, self._flush_results)
     
     def setup_file_selection(self) -> None:
         """设置文件选择区域"""
@@ -307,24 +376,12 @@ class YSTApplication(tk.Tk):
             self.file_path.set(file_path)
             self.logger.debug(f"选择文件: {file_path}")
             
+            # 获取文件信息
+            file_size = self._get_file_size(file_path)
+            
             # 记录操作日志
-            try:
-                from .logger import get_logger_manager
-                logger_manager = get_logger_manager()
-                
-                # 获取文件信息
-                file_size = None
-                try:
-                    file_size = os.path.getsize(file_path)
-                except:
-                    pass
-                
-                logger_manager.log_file_operation(
-                    "文件选择", file_path, "成功", 
-                    file_size=file_size
-                )
-            except Exception as e:
-                self.logger.warning(f"记录操作日志失败: {e}")
+            self._safe_log("log_file_operation", "文件选择", file_path, "成功", 
+                           file_size=file_size)
     
     def browse_directory(self) -> None:
         """选择目录"""
@@ -334,12 +391,7 @@ class YSTApplication(tk.Tk):
             self.logger.debug(f"选择目录: {dir_path}")
             
             # 记录操作日志
-            try:
-                from .logger import get_logger_manager
-                logger_manager = get_logger_manager()
-                logger_manager.log_operation("目录选择", dir_path, "成功")
-            except Exception as e:
-                self.logger.warning(f"记录操作日志失败: {e}")
+            self._safe_log("log_operation", "目录选择", dir_path, "成功")
     
     def check_encryption(self) -> None:
         """检查加密状态"""
@@ -352,51 +404,76 @@ class YSTApplication(tk.Tk):
         self.add_result(f"正在检查: {path}")
         
         # 记录操作开始
-        try:
-            from .logger import get_logger_manager
-            logger_manager = get_logger_manager()
-            logger_manager.log_operation("加密检测开始", path, "进行中")
-        except Exception as e:
-            self.logger.warning(f"记录操作日志失败: {e}")
+        self._safe_log("log_operation", "加密检测开始", path, "进行中")
         
         if os.path.isdir(path):
-            # 扫描目录
-            results = self.detector.scan_directory(path)
-            encrypted_count = sum(1 for r in results if r['status_code'] == 1)
-            total_count = len(results)
-            
-            # 记录操作结果
-            try:
-                logger_manager.log_operation(
-                    "目录加密检测", path, "完成", 
-                    f"总计{total_count}个文件，加密{encrypted_count}个"
-                )
-            except Exception as e:
-                self.logger.warning(f"记录操作日志失败: {e}")
-            
-            for result in results:
-                self.display_check_result(result)
+            # 扫描目录（在后台线程中并行检测，避免阻塞界面）
+            self._submit(self._scan_async, path, self._generation)
+            self._ensure_draining()
         else:
             # 检查单个文件
             result = self.detector.get_detection_result(path)
             
             # 记录操作结果
-            try:
-                file_size = None
-                try:
-                    file_size = os.path.getsize(path)
-                except:
-                    pass
-                
-                logger_manager.log_file_operation(
-                    "文件加密检测", path, result['status'], 
-                    file_size=file_size, file_type=result.get('file_type')
-                )
-            except Exception as e:
-                self.logger.warning(f"记录操作日志失败: {e}")
+            file_size = self._get_file_size(path)
+            self._safe_log("log_file_operation", "文件加密检测", path, result['status'], 
+                           file_size=file_size, file_type=result.get('file_type'))
             
             self.display_check_result(result)
     
+    def _scan_async(self, path: str, generation: int) -> None:
+        """并行检测目录中所有文件的加密状态"""
+        try:
+            encrypted_count = 0
+            total_count = 0
+            
+            def report(done) -> None:
+                nonlocal encrypted_count, total_count
+                for future in done:
+                    file_path = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # 单个文件检测出错不影响其他文件
+                        self._post_result(generation, f"检测文件时出错: {file_path} - {e}", "error")
+                        continue
+                    total_count += 1
+                    if result['status_code'] == 1:
+                        encrypted_count += 1
+                    self._post_result(generation, *self._format_check_result(result))
+            
+            def stopped() -> bool:
+                # 窗口已关闭或结果已被清空（开始了新的操作）
+                return self._closing.is_set() or generation != self._generation
+            
+            # 单独的线程池，避免占满主任务池时互相等待
+            with ThreadPoolExecutor(max_workers=self.max_threads,
+                                    thread_name_prefix="yst-scan") as pool:
+                # 限制在途任务数量，边遍历边显示结果
+                pending = {}
+                for file_path in self._enumerate_files(path):
+                    if stopped():
+                        break
+                    future = pool.submit(self.detector.get_detection_result, file_path)
+                    pending[future] = file_path
+                    if len(pending) >= self.max_threads * 2:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        report(done)
+                
+                if stopped():
+                    # 放弃尚未开始的检测
+                    for future in pending:
+                        future.cancel()
+                    return
+                report(as_completed(list(pending)))
+            
+            # 记录操作结果
+            self._safe_log("log_operation", "目录加密检测", path, "完成", 
+                           f"总计{total_count}个文件，加密{encrypted_count}个")
+        except Exception as e:
+            self._post_result(generation, f"扫描目录时出错: {path} - {e}", "error")
+            self._safe_log("log_operation", "目录加密检测", path, "失败", f"错误: {str(e)}")
+    
     def decrypt_file(self) -> None:
         """解密文件"""
         path = self.file_path.get()
@@ -408,187 +485,248 @@ class YSTApplication(tk.Tk):
         self.add_result(f"正在解密: {path}")
         
         if os.path.isdir(path):
-            # 批量处理目录中的文件
-            for root, _, files in os.walk(path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    self.task_queue.put(('decrypt', file_path))
+            # 批量处理目录中的文件（在后台线程中遍历，避免阻塞界面）
+            self._submit(self._enqueue_tree, path, self._generation)
         else:
             # 处理单个文件
-            self.task_queue.put(('decrypt', path))
+            self._submit(self.process_decrypt_task, path, self._generation)
+        self._ensure_draining()
     
-    def process_queue(self) -> None:
-        """处理任务队列"""
+    def _submit(self, fn, *args) -> None:
+        """提交后台任务并计入未完成任务数，可在工作线程中调用"""
+        with self._outstanding_lock:
+            self._outstanding += 1
         try:
-            # 启动新线程处理任务
-            while len(self.thread_pool) < self.max_threads and not self.task_queue.empty():
-                task_type, file_path = self.task_queue.get()
-                
-                if task_type == 'decrypt':
-                    thread = threading.Thread(
-                        target=self.process_decrypt_task,
-                        args=(file_path,)
-                    )
-                else:
-                    continue
-                
-                thread.start()
-                self.thread_pool.append(thread)
-            
-            # 清理已完成的线程
-            for thread in self.thread_pool:
-                if not thread.is_alive():
-                    self.thread_pool.remove(thread)
-            
-            # 继续检查队列
-            self.after(100, self.process_queue)
-            
-        except Exception as e:
-            self.logger.error(f"处理队列时出错: {e}")
-            self.after(100, self.process_queue)
+            future = self.executor.submit(fn, *args)
+        except RuntimeError:
+            # 窗口关闭后线程池已停止，不再接受任务
+            self._task_done(None)
+            return
+        future.add_done_callback(self._task_done)
+    
+    def _task_done(self, future) -> None:
+        """后台任务结束（完成、出错或取消）时减少未完成任务数"""
+        with self._outstanding_lock:
+            self._outstanding -= 1
+    
+    def _ensure_draining(self) -> None:
+        """开始轮询结果队列（只能在界面线程中调用）"""
+        if self._drain_after_id is None and not self._closing.is_set():
+            self._drain_after_id = self.after(50, self._drain_ui_queue)
+    
+    def _enumerate_files(self, root: str) -> Iterator[str]:
+        """递归枚举目录下的所有文件
+        
+        使用 os.scandir 复用目录读取时得到的类型信息，避免逐个 stat。
+        """
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if self._closing.is_set():
+                            return
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry.path
+            except OSError as e:
+                self.logger.warning(f"无法读取目录: {directory} - {e}")
     
-    def process_decrypt_task(self, file_path: str) -> None:
+    def _enqueue_tree(self, root: str, generation: int) -> None:
+        """遍历目录并提交解密任务"""
+        # 先完成遍历再提交，避免解密生成的文件被再次处理
+        files = list(self._enumerate_files(root))
+        for file_path in files:
+            self._submit(self.process_decrypt_task, file_path, generation)
+    
+    def process_decrypt_task(self, file_path: str, generation: int) -> None:
         """处理解密任务"""
         try:
             # 先检查文件加密状态
             result = self.detector.get_detection_result(file_path)
             
             if result['status_code'] != 1:  # 不是加密文件
-                self.after(0, lambda: self.add_result(
-                    f"跳过非加密文件: {file_path} ({result['status']})", "info"
-                ))
+                self._post_result(generation, f"跳过非加密文件: {file_path} ({result['status']})", "info")
                 
                 # 记录跳过操作
-                try:
-                    from .logger import get_logger_manager
-                    logger_manager = get_logger_manager()
-                    logger_manager.log_file_operation(
-                        "解密跳过", file_path, "非加密文件"
-                    )
-                except Exception as e:
-                    self.logger.warning(f"记录操作日志失败: {e}")
+                self._safe_log("log_file_operation", "解密跳过", file_path, "非加密文件")
                 
                 return
             
+            # 解密前获取一次文件大小，后续日志记录复用
+            file_size = self._get_file_size(file_path)
+            
             # 尝试解密
             program_path = self.config_manager.get_settings().get('wps_path')
             decrypted_path = self.processor.process_encrypted_file(file_path, program_path)
             
             if decrypted_path:
-                self.after(0, lambda: self.add_result(
-                    f"解密成功: {file_path} -> {decrypted_path}", "success"
-                ))
+                self._post_result(generation, f"解密成功: {file_path} -> {decrypted_path}", "success")
+                
+                # 复核解密结果（可通过 verify_after_decrypt 关闭）
+                if not self.config_manager.get_settings().get('verify_after_decrypt', True):
+                    self._safe_log("log_file_operation", "文件解密", file_path, "成功", 
+                                   file_size=file_size, file_type=result.get('file_type'))
+                    return
                 
-                # 复核解密结果
                 verify_result = self.detector.get_detection_result(decrypted_path)
                 
                 if verify_result['status_code'] == 0:
                     # 复核成功，记录完整操作
-                    self.after(0, lambda: self.add_result(
-                        f"复核成功: 文件未加密", "success"
-                    ))
+                    self._post_result(generation, f"复核成功: 文件未加密", "success")
                     
-                    try:
-                        from .logger import get_logger_manager
-                        logger_manager = get_logger_manager()
-                        
-                        # 获取文件大小
-                        file_size = None
-                        try:
-                            file_size = os.path.getsize(file_path)
-                        except:
-                            pass
-                        
-                        logger_manager.log_file_operation(
-                            "文件解密", file_path, "成功并复核通过", 
-                            file_size=file_size, file_type=result.get('file_type')
-                        )
-                        logger_manager.log_operation(
-                            "解密复核", decrypted_path, "通过", "文件已成功解密"
-                        )
-                    except Exception as e:
-                        self.logger.warning(f"记录操作日志失败: {e}")
-                        
+                    self._safe_log("log_file_operation", "文件解密", file_path, "成功并复核通过", 
+                                   file_size=file_size, file_type=result.get('file_type'))
+                    self._safe_log("log_operation", "解密复核", decrypted_path, "通过", 
+                                   "文件已成功解密")
                 else:
                     # 复核失败但仍记录解密操作
-                    self.after(0, lambda: self.add_result(
-                        f"复核警告: 文件可能仍为加密状态", "warning"
-                    ))
+                    self._post_result(generation, f"复核警告: 文件可能仍为加密状态", "warning")
                     
-                    try:
-                        from .logger import get_logger_manager
-                        logger_manager = get_logger_manager()
-                        
-                        file_size = None
-                        try:
-                            file_size = os.path.getsize(file_path)
-                        except:
-                            pass
-                        
-                        logger_manager.log_file_operation(
-                            "文件解密", file_path, "部分成功", 
-                            file_size=file_size, file_type=result.get('file_type')
-                        )
-                        logger_manager.log_operation(
-                            "解密复核", decrypted_path, "警告", "文件可能仍为加密状态"
-                        )
-                    except Exception as e:
-                        self.logger.warning(f"记录操作日志失败: {e}")
+                    self._safe_log("log_file_operation", "文件解密", file_path, "部分成功", 
+                                   file_size=file_size, file_type=result.get('file_type'))
+                    self._safe_log("log_operation", "解密复核", decrypted_path, "警告", 
+                                   "文件可能仍为加密状态")
             else:
-                self.after(0, lambda: self.add_result(
-                    f"解密失败: {file_path}", "error"
-                ))
+                self._post_result(generation, f"解密失败: {file_path}", "error")
                 
                 # 记录解密失败
-                try:
-                    from .logger import get_logger_manager
-                    logger_manager = get_logger_manager()
-                    logger_manager.log_file_operation(
-                        "文件解密", file_path, "失败"
-                    )
-                except Exception as e:
-                    self.logger.warning(f"记录操作日志失败: {e}")
+                self._safe_log("log_file_operation", "文件解密", file_path, "失败")
                 
         except Exception as e:
-            self.after(0, lambda: self.add_result(
-                f"处理文件时出错: {file_path} - {e}", "error"
-            ))
+            self._post_result(generation, f"处理文件时出错: {file_path} - {e}", "error")
             
             # 记录处理异常
-            try:
-                from .logger import get_logger_manager
-                logger_manager = get_logger_manager()
-                logger_manager.log_operation(
-                    "处理异常", file_path, "失败", f"错误: {str(e)}"
-                )
-            except Exception as log_e:
-                self.logger.warning(f"记录操作日志失败: {log_e}")
+            self._safe_log("log_operation", "处理异常", file_path, "失败", f"错误: {str(e)}")
+    
+    def _get_file_size(self, path: str) -> Optional[int]:
+        """获取文件大小，无法访问时返回 None"""
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return None
+    
+    def _safe_log(self, method: str, *args, **kwargs) -> None:
+        """调用操作日志记录方法，记录失败时仅输出警告"""
+        try:
+            getattr(self.logger_manager, method)(*args, **kwargs)
+        except Exception as e:
+            self.logger.warning(f"记录操作日志失败: {e}")
     
     def display_check_result(self, result: Dict) -> None:
         """显示检查结果"""
-        status_map = {
-            '未加密': 'info',
-            '已加密': 'warning',
-            '未识别': 'warning',
-            '文件不存在': 'error'
-        }
-        
-        tag = status_map.get(result['status'], 'debug')
-        message = f"{result['status']}: {result['file_path']}"
-        self.add_result(message, tag)
+        self.add_result(*self._format_check_result(result))
+    
+    def _format_check_result(self, result: Dict) -> Tuple[str, str]:
+        """生成检查结果的显示文本和标签"""
+        tag = _STATUS_TAG.get(result['status'], 'debug')
+        return f"{result['status']}: {result['file_path']}", tag
+    
+    def _post_result(self, generation: int, message: str, tag: str) -> None:
+        """从工作线程回传一条结果，由界面线程取出显示"""
+        self._ui_queue.put((generation, message, tag))
     
     def add_result(self, message: str, tag: str = "debug") -> None:
-        """添加结果到显示区域"""
-        if hasattr(self, 'result_text'):
-            self.result_text.insert(tk.END, f"{message}\n", tag)
-            self.result_text.see(tk.END)
-            self.update()
+        """添加结果到显示区域（批量刷新）"""
+        self._pending_results.append((message, tag))
+        self._result_log.append(message)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.after(50, self._flush_results)
+    
+    def _drain_ui_queue(self) -> None:
+        """取出工作线程回传的结果并批量显示"""
+        try:
+            drained = False
+            while True:
+                try:
+                    generation, message, tag = self._ui_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if generation != self._generation:
+                    # 清空结果之前的操作回传的结果，不再显示
+                    continue
+                self._pending_results.append((message, tag))
+                self._result_log.append(message)
+                drained = True
+            
+            if drained and not self._flush_scheduled:
+                self._flush_results()
+        finally:
+            # 无论显示是否出错，只要仍有任务或结果就继续处理队列
+            # 先看任务数再看队列：任务结束前结果已入队，不会遗漏
+            with self._outstanding_lock:
+                busy = self._outstanding > 0
+            if busy or not self._ui_queue.empty():
+                self._drain_after_id = self.after(50, self._drain_ui_queue)
+            else:
+                self._drain_after_id = None
+    
+    def _flush_results(self) -> None:
+        """将缓冲的结果一次性写入显示区域"""
+        self._flush_scheduled = False
+        if not self._pending_results:
+            return
+        
+        # 不在主界面时保留缓冲，返回主界面后再显示
+        if self.result_text is None or not self.result_text.winfo_exists():
+            return
+        
+        batch = list(self._pending_results)
+        self._pending_results.clear()
+        
+        # 相同标签的连续消息合并为一次插入
+        run_tag = batch[0][1]
+        run_lines = []
+        for message, tag in batch:
+            if tag != run_tag:
+                self.result_text.insert(tk.END, "".join(run_lines), run_tag)
+                run_tag, run_lines = tag, []
+            run_lines.append(f"{message}\n")
+        self.result_text.insert(tk.END, "".join(run_lines), run_tag)
+        
+        # 超出上限时淘汰最早的行，保持控件布局开销恒定
+        # 每条结果以换行结尾，end-1c 落在末尾空行上，因此减一
+        line_count = int(self.result_text.index('end-1c').split('.')[0]) - 1
+        if line_count > MAX_RESULT_LINES:
+            excess = line_count - MAX_RESULT_LINES
+            self.result_text.delete('1.0', f'{excess + 1}.0')
+        self.result_text.see(tk.END)
     
     def clear_results(self) -> None:
         """清空结果显示区域"""
-        if hasattr(self, 'result_text'):
+        # 作废之前的结果批次，仍在运行的扫描随之停止
+        self._generation += 1
+        self._pending_results.clear()
+        self._result_log.clear()
+        if self.result_text is not None and self.result_text.winfo_exists():
             self.result_text.delete(1.0, tk.END)
     
+    def export_results(self) -> None:
+        """导出完整结果记录到文件"""
+        if not self._result_log:
+            messagebox.showinfo("提示", "当前没有可导出的结果！")
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            title="导出结果", defaultextension=".txt",
+            filetypes=[("文本文件", "*.txt"), ("所有文件", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write("\n".join(self._result_log))
+                f.write("\n")
+            messagebox.showinfo("成功", f"结果已导出到: {file_path}")
+            self.logger.info(f"导出结果: {file_path}")
+        except OSError as e:
+            messagebox.showerror("错误", f"导出结果失败: {e}")
+            self.logger.error(f"导出结果失败: {e}")
+    
     def add_extension(self) -> None:
         """添加扩展名"""
         extension = self.extension_var.get().strip()
@@ -611,6 +749,7 @@ class YSTApplication(tk.Tk):
             return
         
         if self.config_manager.add_header(header_hex, file_type):
+            self._headers_rendered = None
             self.header_var.set("")
             self.header_type_var.set("")
             messagebox.showinfo("成功", f"已添加文件头: {header_hex} ({file_type})")
@@ -626,13 +765,21 @@ class YSTApplication(tk.Tk):
     
     def view_headers(self) -> None:
         """查看所有文件头"""
-        headers = self.config_manager.get_headers()
-        headers_list = "\n".join([f"{header.hex().upper()} ({file_type})" 
-                                 for header, file_type in headers.items()])
-        if not headers_list:
-            headers_list = "无"
+        headers_list = self._render_headers() or "无"
         messagebox.showinfo("标准文件头列表", f"当前支持的标准文件头:\n\n{headers_list}")
     
+    def _render_headers(self) -> str:
+        """生成文件头列表文本，结果缓存至文件头变更"""
+        if self._headers_rendered is None:
+            buf = io.StringIO()
+            for header, file_type in self.config_manager.get_headers().items():
+                buf.write(header.hex().upper())
+                buf.write(" (")
+                buf.write(file_type)
+                buf.write(")\n")
+            self._headers_rendered = buf.getvalue().rstrip("\n")
+        return self._headers_rendered
+    
     def save_settings(self) -> None:
         """保存设置"""
         if self.config_manager.save_config():
@@ -656,12 +803,7 @@ class YSTApplication(tk.Tk):
                 self.logger.info("开始检查新版本")
                 
                 # 记录操作日志
-                try:
-                    from .logger import get_logger_manager
-                    logger_manager = get_logger_manager()
-                    logger_manager.log_operation("版本检查", "online", "进行中")
-                except:
-                    pass
+                self._safe_log("log_operation", "版本检查", "online", "进行中")
                 
                 # 版本检查API（这里使用GitHub API作为示例）
                 # 实际使用时需要替换为真实的版本检查接口
@@ -669,18 +811,23 @@ class YSTApplication(tk.Tk):
                 # 如果使用自己的服务器，可以替换为：
                 # api_url = "https://your-server.com/api/version"
                 
-                # 设置请求超时
-                response = requests.get(api_url, timeout=10)
+                # 设置请求超时（连接, 读取）
+                response = self._http.get(
+                    api_url, timeout=(3.05, 10),
+                    headers={"Accept": "application/vnd.github+json"}
+                )
                 
                 if response.status_code == 200:
-                    release_info = response.json()
-                    latest_version = release_info.get('tag_name', '').lstrip('v')
+                    # 只保留需要的字段，尽早释放完整的发布信息
+                    release_info = json.loads(response.content)
+                    latest_version = _TAG_STRIP.sub('', release_info.get('tag_name') or '')
                     download_url = release_info.get('html_url', '')
-                    release_notes = release_info.get('body', '')
+                    release_notes = (release_info.get('body') or '')[:200]
+                    del release_info
                     
                     current_version = "5.1"
                     
-                    if self._compare_versions(latest_version, current_version) > 0:
+                    if self._is_newer_version(latest_version, current_version):
                         # 有新版本
                         self.update_status_var.set("发现新版本！")
                         message = f"""发现新版本：{latest_version}
@@ -689,18 +836,13 @@ class YSTApplication(tk.Tk):
 最新版本：{latest_version}
 
 更新说明：
-{release_notes[:200]}...
+{release_notes}...
 
 是否前往下载页面？"""
                         
                         # 记录新版本发现
-                        try:
-                            logger_manager.log_operation(
-                                "版本检查", "online", "发现新版本", 
-                                f"当前: {current_version}, 最新: {latest_version}"
-                            )
-                        except:
-                            pass
+                        self._safe_log("log_operation", "版本检查", "online", "发现新版本", 
+                                       f"当前: {current_version}, 最新: {latest_version}")
                         
                         # 在主线程中显示消息框
                         self.after(0, lambda: self.show_update_dialog(message, download_url))
@@ -711,13 +853,8 @@ class YSTApplication(tk.Tk):
                             f"当前版本 {current_version} 已是最新版本！"))
                         
                         # 记录检查结果
-                        try:
-                            logger_manager.log_operation(
-                                "版本检查", "online", "已是最新版本", 
-                                f"当前版本: {current_version}"
-                            )
-                        except:
-                            pass
+                        self._safe_log("log_operation", "版本检查", "online", "已是最新版本", 
+                                       f"当前版本: {current_version}")
                 else:
                     # 网络请求失败
                     self.update_status_var.set("检查失败")
@@ -725,13 +862,8 @@ class YSTApplication(tk.Tk):
                         f"无法连接到版本检查服务器，状态码：{response.status_code}"))
                     
                     # 记录检查失败
-                    try:
-                        logger_manager.log_operation(
-                            "版本检查", "online", "失败", 
-                            f"HTTP状态码: {response.status_code}"
-                        )
-                    except:
-                        pass
+                    self._safe_log("log_operation", "版本检查", "online", "失败", 
+                                   f"HTTP状态码: {response.status_code}")
                     
             except requests.exceptions.Timeout:
                 self.update_status_var.set("检查超时")
@@ -739,10 +871,7 @@ class YSTApplication(tk.Tk):
                     "网络连接超时，请检查网络连接后重试。"))
                 
                 # 记录超时
-                try:
-                    logger_manager.log_operation("版本检查", "online", "超时", "网络连接超时")
-                except:
-                    pass
+                self._safe_log("log_operation", "版本检查", "online", "超时", "网络连接超时")
                     
             except requests.exceptions.ConnectionError:
                 self.update_status_var.set("网络错误")
@@ -750,10 +879,7 @@ class YSTApplication(tk.Tk):
                     "网络连接错误，请检查网络连接。"))
                 
                 # 记录网络错误
-                try:
-                    logger_manager.log_operation("版本检查", "online", "网络错误", "连接失败")
-                except:
-                    pass
+                self._safe_log("log_operation", "版本检查", "online", "网络错误", "连接失败")
                     
             except Exception as e:
                 self.update_status_var.set("检查失败")
@@ -761,57 +887,46 @@ class YSTApplication(tk.Tk):
                     f"版本检查时发生错误：{str(e)}"))
                 
                 # 记录异常
-                try:
-                    logger_manager.log_operation(
-                        "版本检查", "online", "异常", 
-                        f"错误: {str(e)}"
-                    )
-                except:
-                    pass
+                self._safe_log("log_operation", "版本检查", "online", "异常", 
+                               f"错误: {str(e)}")
         
         # 在新线程中执行版本检查
         thread = threading.Thread(target=check_updates_thread, daemon=True)
         thread.start()
     
-    def _compare_versions(self, version1: str, version2: str) -> int:
-        """比较版本号
+    def _is_newer_version(self, latest: str, current: str) -> bool:
+        """判断最新版本是否高于当前版本，无法解析时视为不高于
         Args:
-            version1: 版本1
-            version2: 版本2
+            latest: 最新版本
+            current: 当前版本
         Returns:
-            int: 0=相等, 1=version1>version2, -1=version1<version2
+            bool: latest > current
         """
+        if PACKAGING_AVAILABLE:
+            try:
+                return Version(latest) > Version(current)
+            except InvalidVersion:
+                return False
+        
         try:
-            v1_parts = [int(x) for x in version1.split('.')]
-            v2_parts = [int(x) for x in version2.split('.')]
-            
-            # 补齐长度
-            max_len = max(len(v1_parts), len(v2_parts))
-            v1_parts.extend([0] * (max_len - len(v1_parts)))
-            v2_parts.extend([0] * (max_len - len(v2_parts)))
-            
-            for i in range(max_len):
-                if v1_parts[i] > v2_parts[i]:
-                    return 1
-                elif v1_parts[i] < v2_parts[i]:
-                    return -1
-            
-            return 0
-        except:
-            return 0
+            latest_parts = [int(x) for x in latest.split('.')]
+            current_parts = [int(x) for x in current.split('.')]
+        except ValueError:
+            return False
+        
+        # 补齐长度后逐段比较
+        max_len = max(len(latest_parts), len(current_parts))
+        latest_parts.extend([0] * (max_len - len(latest_parts)))
+        current_parts.extend([0] * (max_len - len(current_parts)))
+        return latest_parts > current_parts
     
     def show_update_dialog(self, message: str, download_url: str) -> None:
         """显示更新对话框"""
         result = messagebox.askyesno("发现新版本", message)
         if result and download_url:
             # 记录用户选择前往下载
-            try:
-                from .logger import get_logger_manager
-                logger_manager = get_logger_manager()
-                logger_manager.log_operation("版本更新", "download", "用户选择前往下载", 
-                                           f"下载页面: {download_url}")
-            except:
-                pass
+            self._safe_log("log_operation", "版本更新", "download", "用户选择前往下载", 
+                           f"下载页面: {download_url}")
             
             # 打开下载链接（可选功能）
             try:
@@ -819,6 +934,23 @@ class YSTApplication(tk.Tk):
                 webbrowser.open(download_url)
             except:
                 messagebox.showinfo("下载链接", f"请手动访问以下链接下载新版本：\n{download_url}")
+    
+    def _on_close(self) -> None:
+        """关闭窗口"""
+        self._closing.set()
+        if self._drain_after_id is not None:
+            self.after_cancel(self._drain_after_id)
+            self._drain_after_id = None
+        self.destroy()
+    
+    def destroy(self) -> None:
+        """关闭窗口并停止后台任务"""
+        # 直接调用 destroy 时同样通知后台遍历和扫描退出
+        self._closing.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self._http is not None:
+            self._http.close()
+        super().destroy()
 
 
 def run_gui() -> None:
@@ -25,25 +25,53 @@ YST5.1 文件加密检测与解密工具
 
 import sys
 import os
-
-# 添加模块路径
-current_dir = os.path.dirname(os.path.abspath(__file__))
-modules_dir = os.path.join(current_dir, 'modules')
-if modules_dir not in sys.path:
-    sys.path.insert(0, modules_dir)
+import importlib
+import logging
+from functools import lru_cache, partial
+from concurrent.futures import (ProcessPoolExecutor, FIRST_COMPLETED, 
+                                as_completed, wait)
 
 try:
     from modules.config import get_config_manager
     from modules.logger import get_logger
-    from modules.gui import run_gui
-    from modules.cli import run_cli
-    from modules.encryption_detector import check_file_encryption, check_file_encryption_with_feedback
-    from modules.file_processor import open_and_process_file
 except ImportError as e:
     print(f"导入模块失败: {e}")
     print("请确保 modules 目录存在且包含所有必要的模块文件")
     sys.exit(1)
 
+# 检测和解密函数，首次处理文件时由 _load_processing 导入
+check_file_encryption_with_feedback = None
+open_and_process_file = None
+
+
+def _require(module_name):
+    """导入 modules 下的模块，失败时给出提示并退出"""
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        print(f"导入模块失败: {e}")
+        print("请确保 modules 目录存在且包含所有必要的模块文件")
+        sys.exit(1)
+
+
+def _load_processing():
+    """导入检测和解密函数，每个进程只导入一次"""
+    global check_file_encryption_with_feedback, open_and_process_file
+    
+    if check_file_encryption_with_feedback is None:
+        check_file_encryption_with_feedback = _require(
+            'modules.encryption_detector').check_file_encryption_with_feedback
+        open_and_process_file = _require('modules.file_processor').open_and_process_file
+
+# 兼容模式下每输出多少个文件的结果刷新一次标准输出
+STDOUT_FLUSH_INTERVAL = 64
+
+# 解密后快速复核时识别的明文文件头：OLE 复合文档、ZIP（OOXML）、PDF
+# 实际只使用其中被配置的标准文件头覆盖的部分，见 _quick_verify_magic
+_PLAIN_MAGIC = (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', b'PK\x03\x04', b'%PDF')
+# 快速复核时读取的字节数，取最长文件头的长度
+_PLAIN_MAGIC_LEN = max(len(magic) for magic in _PLAIN_MAGIC)
+
 
 def print_usage():
     """打印使用说明"""
@@ -78,82 +106,348 @@ YST5.1 文件加密检测与解密工具
     """)
 
 
+@lru_cache(maxsize=None)
+def _quick_verify_magic():
+    """快速复核使用的文件头
+    
+    只保留能被配置中的标准文件头匹配的明文格式，使快速复核与检测模块
+    的文件头判断一致；未配置的格式一律走完整检测。
+    """
+    headers = get_config_manager().get_headers()
+    return tuple(magic for magic in _PLAIN_MAGIC 
+                 if any(magic.startswith(header) for header in headers))
+
+
+def _quick_verify(path):
+    """快速复核：只读取文件头判断是否为已配置的常见明文格式
+    
+    只比较文件头，不考虑扩展名等其他检测条件；不匹配时由调用方
+    进行完整检测。
+    
+    Returns:
+        bool: 文件头匹配时返回 True
+    """
+    magic = _quick_verify_magic()
+    if not magic:
+        return False
+    
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    except OSError:
+        return False
+    try:
+        header = os.read(fd, _PLAIN_MAGIC_LEN)
+    finally:
+        os.close(fd)
+    return header.startswith(magic)
+
+
+def _handle_encrypted(path, program_path, verify, records):
+    """已加密文件：尝试解密并复核"""
+    message = f"尝试解密: {path}"
+    records.append((logging.INFO, message, message))
+    
+    decrypted_path = open_and_process_file(path, program_path)
+    
+    if decrypted_path:
+        records.append((logging.INFO, f"解密成功: {decrypted_path}", 
+                        f"解密成功: {path} -> {decrypted_path}"))
+        
+        # 复核结果：常见明文文件头直接通过，其余再做完整检测
+        if verify:
+            if (_quick_verify(decrypted_path) or 
+                    check_file_encryption_with_feedback(decrypted_path)['status_code'] == 0):
+                records.append((logging.INFO, "复核成功: 文件未加密", 
+                                f"复核成功: {decrypted_path}"))
+            else:
+                records.append((logging.WARNING, "复核警告: 文件可能仍为加密状态", 
+                                f"复核警告: {decrypted_path}"))
+    else:
+        records.append((logging.ERROR, "解密失败", f"解密失败: {path}"))
+
+
+def _handle_unencrypted(path, program_path, verify, records):
+    """未加密文件：跳过解密"""
+    records.append((logging.INFO, "文件未加密，跳过解密", f"文件未加密，跳过解密: {path}"))
+
+
+def _handle_unknown(path, program_path, verify, records):
+    """未识别文件：跳过处理"""
+    records.append((logging.WARNING, "文件未识别，跳过处理", f"文件未识别，跳过处理: {path}"))
+
+
+# 检测状态码到处理函数的映射，未列出的状态码按未识别处理
+_STATUS_HANDLERS = {
+    0: _handle_unencrypted,
+    1: _handle_encrypted,
+}
+
+
+def _process_one(path, program_path, verify=True, exists=None):
+    """兼容模式下处理单个文件：检测、解密并复核
+    
+    在子进程中执行，不直接输出，由主进程统一打印和记录日志。
+    
+    Args:
+        path: 文件路径
+        program_path: 解密程序路径
+        verify: 解密后是否复核
+        exists: 调用方已确认的文件是否存在，None 表示需要检查
+        
+    Returns:
+        list: 输出记录列表，每项为 (日志级别, 控制台信息, 日志信息)
+    """
+    # 子进程不继承主进程中已导入的函数，需各自导入一次
+    _load_processing()
+    
+    records = []
+    
+    if exists is None:
+        exists = os.path.exists(path)
+    if not exists:
+        message = f"文件不存在: {path}"
+        records.append((logging.ERROR, message, message))
+        return records
+    
+    try:
+        # 检查文件，按状态码分派处理
+        result = check_file_encryption_with_feedback(path)
+        message = f"{result['status']}: {path}"
+        records.append((logging.INFO, message, message))
+        
+        handler = _STATUS_HANDLERS.get(result['status_code'], _handle_unknown)
+        handler(path, program_path, verify, records)
+    except Exception as e:
+        # 单个文件出错不影响其他文件的处理
+        message = f"处理文件时出错: {path} - {e}"
+        records.append((logging.ERROR, message, message))
+    
+    return records
+
+
+def iter_files(root):
+    """递归枚举目录下的所有文件
+    
+    使用 os.scandir 复用目录读取时得到的类型信息，避免逐个 stat。
+    
+    Args:
+        root: 目录路径
+        
+    Yields:
+        str: 文件路径
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry.path
+        except OSError:
+            continue
+
+
+def _triage_paths(paths):
+    """确认命令行路径的类型
+    
+    多个参数位于同一目录时（如 shell 展开的 *.docx），只对该目录执行
+    一次 os.scandir，复用目录项中的类型信息；其余路径以及目录中
+    找不到的名称（如大小写不同）再单独检查。
+    
+    Yields:
+        tuple: (路径, 类型)，类型为 'dir'、'file' 或 None（不存在）
+    """
+    groups = {}
+    for path in paths:
+        groups.setdefault(os.path.dirname(path), []).append(path)
+    
+    entries = {}
+    for parent, members in groups.items():
+        if len(members) < 2:
+            continue
+        try:
+            with os.scandir(parent or '.') as it:
+                entries[parent] = {entry.name: entry for entry in it}
+        except OSError:
+            continue
+    
+    for path in paths:
+        entry = entries.get(os.path.dirname(path), {}).get(os.path.basename(path))
+        # 只信任能确认类型的目录项，失效的符号链接等交给 os.path 判断
+        if entry is not None and entry.is_dir():
+            yield path, 'dir'
+        elif entry is not None and entry.is_file():
+            yield path, 'file'
+        elif os.path.isdir(path):
+            yield path, 'dir'
+        elif os.path.exists(path):
+            yield path, 'file'
+        else:
+            yield path, None
+
+
+def _collect_inputs(paths):
+    """展开参数中的目录，返回 (文件路径, 是否存在) 列表
+    
+    在开始解密前一次性完成遍历，避免解密生成的文件被再次处理。
+    """
+    inputs = []
+    for path, kind in _triage_paths(paths):
+        if kind == 'dir':
+            inputs.extend((file_path, True) for file_path in iter_files(path))
+        else:
+            inputs.append((path, kind is not None))
+    return inputs
+
+
+def _run_compat(paths, program_path, verify, logger):
+    """兼容模式：处理命令行给出的文件和目录
+    
+    单个文件直接处理；否则先确定全部待处理文件，再提交到进程池
+    并按完成顺序输出结果。
+    """
+    # 在启动进程池前导入，缺少模块时直接给出提示
+    _load_processing()
+    
+    # 固定本次运行不变的参数，循环中只传入文件相关参数
+    process = partial(_process_one, program_path=program_path, verify=verify)
+    
+    if len(paths) == 1 and not os.path.isdir(paths[0]):
+        _emit_records([process(paths[0])], logger)
+        return
+    
+    max_workers = os.cpu_count() or 1
+    if sys.platform == 'win32':
+        # Windows 下进程池最多支持 61 个工作进程
+        max_workers = min(max_workers, 61)
+    inputs = _collect_inputs(paths)
+    
+    # 输出重定向时按块缓冲，每 STDOUT_FLUSH_INTERVAL 个文件刷新一次以显示进度
+    unflushed = 0
+    
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        pending = set()
+        for path, exists in inputs:
+            pending.add(executor.submit(process, path, exists=exists))
+            
+            # 限制在途任务数量，已完成的结果及时输出
+            if len(pending) >= max_workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                unflushed += _emit_records((future.result() for future in done), logger)
+                if unflushed >= STDOUT_FLUSH_INTERVAL:
+                    sys.stdout.flush()
+                    unflushed = 0
+        
+        for future in as_completed(pending):
+            unflushed += _emit_records([future.result()], logger)
+            if unflushed >= STDOUT_FLUSH_INTERVAL:
+                sys.stdout.flush()
+                unflushed = 0
+    except BaseException:
+        # 中断或出错时取消尚未开始的任务
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        executor.shutdown(wait=True)
+        sys.stdout.flush()
+
+
+def _emit_records(results, logger):
+    """输出处理记录到控制台和日志
+    
+    同一批记录合并为一次控制台写入。
+    
+    Returns:
+        int: 输出的文件数
+    """
+    count = 0
+    lines = []
+    for records in results:
+        count += 1
+        for level, console_message, log_message in records:
+            lines.append(console_message)
+            logger.log(level, log_message)
+    
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+    return count
+
+
+def _show_version():
+    """打印版本信息"""
+    print("YST5.1 文件加密检测与解密工具 v6.0")
+
+
+def _run_cli_mode(settings, logger):
+    """使用新的命令行接口"""
+    _require('modules.cli').run_cli()
+
+
+def _run_compat_mode(settings, logger):
+    """兼容旧版用法：直接处理文件路径"""
+    logger.info("使用兼容模式处理文件")
+    
+    paths = sys.argv[1:]
+    program_path = settings.get('wps_path')
+    verify = settings.get('verify_after_decrypt', True)
+    _run_compat(paths, program_path, verify, logger)
+
+
+# 帮助和版本命令，不需要加载配置和日志
+_INFO_COMMANDS = {sys.intern(name): command for name, command in {
+    '-h': print_usage,
+    '--help': print_usage,
+    'help': print_usage,
+    '-v': _show_version,
+    '--version': _show_version,
+    'version': _show_version,
+}.items()}
+
+# 第一个参数到处理函数的映射，未列出的参数按兼容模式处理
+_DISPATCH = {sys.intern(name): action for name, action in {
+    'check': _run_cli_mode,
+    'unlock': _run_cli_mode,
+    'scan': _run_cli_mode,
+    'batch-unlock': _run_cli_mode,
+}.items()}
+
+
 def main():
     """主函数"""
-    config_manager = None
     logger = None
+    debug = False
+    # 命令表的键在定义时已显式驻留，驻留参数后查表可直接按地址比较
+    first_arg = sys.intern(sys.argv[1].lower()) if len(sys.argv) > 1 else None
+    
+    # 帮助和版本信息直接输出，不初始化配置和日志
+    info_command = _INFO_COMMANDS.get(first_arg)
+    if info_command:
+        info_command()
+        return
     
     try:
         # 初始化配置和日志
         config_manager = get_config_manager()
         logger = get_logger()
         
+        # 读取一次设置快照，后续直接使用
+        settings = dict(config_manager.get_settings())
+        debug = settings.get('debug', False)
+        
         logger.info("程序启动")
         
         # 检查命令行参数
-        if len(sys.argv) > 1:
-            first_arg = sys.argv[1].lower()
-            
-            # 帮助和版本信息
-            if first_arg in ('-h', '--help', 'help'):
-                print_usage()
-                return
-            elif first_arg in ('-v', '--version', 'version'):
-                print("YST5.1 文件加密检测与解密工具 v6.0")
-                return
-            
-            # 检查是否是模块化命令
-            if first_arg in ('check', 'unlock', 'scan', 'batch-unlock'):
-                # 使用新的命令行接口
-                run_cli()
-            else:
-                # 兼容旧版用法：直接处理文件路径
-                logger.info("使用兼容模式处理文件")
-                
-                paths = sys.argv[1:]
-                for path in paths:
-                    if os.path.exists(path):
-                        # 检查文件
-                        result = check_file_encryption_with_feedback(path)
-                        print(f"{result['status']}: {path}")
-                        logger.info(f"{result['status']}: {path}")
-                        
-                        # 如果是加密文件，尝试解密
-                        if result['status_code'] == 1:
-                            print(f"尝试解密: {path}")
-                            logger.info(f"尝试解密: {path}")
-                            
-                            program_path = config_manager.get_settings().get('wps_path')
-                            decrypted_path = open_and_process_file(path, program_path)
-                            
-                            if decrypted_path:
-                                print(f"解密成功: {decrypted_path}")
-                                logger.info(f"解密成功: {path} -> {decrypted_path}")
-                                
-                                # 复核结果
-                                verify_result = check_file_encryption_with_feedback(decrypted_path)
-                                if verify_result['status_code'] == 0:
-                                    print("复核成功: 文件未加密")
-                                    logger.info(f"复核成功: {decrypted_path}")
-                                else:
-                                    print("复核警告: 文件可能仍为加密状态")
-                                    logger.warning(f"复核警告: {decrypted_path}")
-                            else:
-                                print("解密失败")
-                                logger.error(f"解密失败: {path}")
-                        elif result['status_code'] == 0:
-                            print("文件未加密，跳过解密")
-                            logger.info(f"文件未加密，跳过解密: {path}")
-                        else:
-                            print("文件未识别，跳过处理")
-                            logger.warning(f"文件未识别，跳过处理: {path}")
-                    else:
-                        print(f"文件不存在: {path}")
-                        logger.error(f"文件不存在: {path}")
+        if first_arg is not None:
+            action = _DISPATCH.get(first_arg, _run_compat_mode)
+            action(settings, logger)
         else:
             # 没有参数，启动图形界面
             logger.info("启动图形界面")
-            run_gui()
+            _require('modules.gui').run_gui()
             
     except KeyboardInterrupt:
         print("\n程序被用户中断")
@@ -162,12 +456,11 @@ def main():
     except Exception as e:
         print(f"程序运行出错: {e}")
         if logger:
-            logger.error(f"程序运行出错: {e}")
-        
-        # 在调试模式下显示详细错误信息
-        if config_manager and config_manager.get_settings().get('debug', False):
-            import traceback
-            traceback.print_exc()
+            # 在调试模式下同时记录详细错误堆栈
+            if debug:
+                logger.exception(f"程序运行出错: {e}")
+            else:
+                logger.error(f"程序运行出错: {e}")
     finally:
         if logger:
             logger.info("程序结束")